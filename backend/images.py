@@ -0,0 +1,81 @@
+"""Featured image processing.
+
+Runs inside worker processes, so it depends only on Pillow and the
+filesystem, never on the database or the FastAPI app.
+"""
+import base64
+import io
+import os
+
+from PIL import Image, ImageFilter, ImageOps
+
+VARIANT_WIDTHS = (480, 960, 1600)
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_MAX_HEIGHT = 64
+# WebP caps each dimension at 16383px (JPEG allows 65535)
+MAX_VARIANT_HEIGHT = 16383
+JPEG_BACKGROUND = (10, 10, 10)  # card background, #0A0A0A
+
+# (Pillow format, extension, supports alpha, save options)
+VARIANT_FORMATS = (
+    ("WEBP", "webp", True, {"quality": 80, "method": 4}),
+    ("JPEG", "jpg", False, {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+def variant_widths(width):
+    """Target widths for an image, never upscaling past the original."""
+    widths = [w for w in VARIANT_WIDTHS if w < width]
+    widths.append(min(width, VARIANT_WIDTHS[-1]))
+    return sorted(set(widths))
+
+def variant_sizes(width, height):
+    """(width, height) of each variant that fits within the encoders' limits."""
+    sizes = []
+    for w in variant_widths(width):
+        h = max(1, round(height * w / width))
+        if h <= MAX_VARIANT_HEIGHT:
+            sizes.append((w, h))
+    return sizes
+
+def flatten(img):
+    """Composite a transparent image onto the card background for JPEG output."""
+    if img.mode != "RGBA":
+        return img
+    background = Image.new("RGBA", img.size, JPEG_BACKGROUND + (255,))
+    return Image.alpha_composite(background, img).convert("RGB")
+
+def make_placeholder(img):
+    img = flatten(img)
+    # Very tall images would exceed the JPEG limit; the blur is cropped by CSS anyway
+    height = min(PLACEHOLDER_MAX_HEIGHT, max(1, round(img.height * PLACEHOLDER_WIDTH / img.width)))
+    tiny = img.resize((PLACEHOLDER_WIDTH, height), Image.LANCZOS).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    tiny.save(buffer, "JPEG", quality=50)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+def process_image(original_path, variants_dir, image_id):
+    """Write WebP/JPEG variants of an original and return their metadata."""
+    os.makedirs(variants_dir, exist_ok=True)
+    with Image.open(original_path) as source:
+        img = ImageOps.exif_transpose(source)
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+    sizes = variant_sizes(img.width, img.height)
+    if not sizes:
+        raise ValueError(f"Aspect ratio of {img.width}x{img.height} is too extreme for any variant")
+
+    variants = []
+    for width, height in sizes:
+        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+        for fmt, ext, supports_alpha, options in VARIANT_FORMATS:
+            output = resized if supports_alpha else flatten(resized)
+            output.save(os.path.join(variants_dir, f"{image_id}-{width}.{ext}"), fmt, **options)
+        variants.append({"width": width, "height": height})
+
+    return {
+        "width": img.width,
+        "height": img.height,
+        "variants": variants,
+        "placeholder": make_placeholder(img),
+    }
@@ -1,4 +1,5 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, File, UploadFile, status
+from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
@@ -8,12 +9,26 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pymongo import MongoClient
 from bson import ObjectId
+from bson.errors import InvalidId
+from PIL import Image
 import os
+import io
+import uuid
+import hashlib
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from urllib.parse import urlparse
 from dotenv import load_dotenv
+from images import process_image, variant_sizes
 
 load_dotenv()
 
 app = FastAPI(title="PatangeNotes API", version="1.0.0")
+logger = logging.getLogger("patangenotes")
 
 # CORS
 app.add_middleware(
@@ -35,6 +50,24 @@ JWT_SECRET = os.environ.get("JWT_SECRET")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
+# Publishing
+POST_STATUSES = ("draft", "scheduled", "published")
+PUBLISH_POLL_SECONDS = int(os.environ.get("PUBLISH_POLL_SECONDS", "30"))
+
+# Images
+UPLOAD_DIR = os.environ.get("UPLOAD_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads"))
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", "2"))
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10 MB
+MEDIA_URL_PREFIX = "/api/media"
+MEDIA_CACHE_CONTROL = "public, max-age=31536000, immutable"
+IMAGE_CLAIM_TIMEOUT_SECONDS = 10 * 60
+ALLOWED_IMAGE_FORMATS = {
+    "JPEG": ".jpg",
+    "PNG": ".png",
+    "WEBP": ".webp",
+    "GIF": ".gif",
+}
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
@@ -56,6 +89,8 @@ class BlogPostCreate(BaseModel):
     featured_image: Optional[str] = ""
     sources: Optional[List[str]] = []
     is_featured: Optional[bool] = False
+    status: Optional[str] = "published"
+    publish_at: Optional[str] = None
 
 class BlogPostUpdate(BaseModel):
     title: Optional[str] = None
@@ -66,6 +101,8 @@ class BlogPostUpdate(BaseModel):
     featured_image: Optional[str] = None
     sources: Optional[List[str]] = None
     is_featured: Optional[bool] = None
+    status: Optional[str] = None
+    publish_at: Optional[str] = None
 
 class NewsletterSubscribe(BaseModel):
     email: EmailStr
@@ -101,6 +138,206 @@ def serialize_doc(doc):
 def serialize_docs(docs):
     return [serialize_doc(doc) for doc in docs]
 
+def resolve_publish_state(post_status, publish_at):
+    """Validate a status/publish_at pair and return it normalized to UTC ISO.
+
+    Scheduled posts whose publish_at has already passed are published right
+    away; published posts never carry a publish_at in the future.
+    """
+    if post_status not in POST_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status, expected one of {', '.join(POST_STATUSES)}")
+    now = datetime.now(timezone.utc)
+    when = None
+    if publish_at:
+        try:
+            when = datetime.fromisoformat(publish_at.replace("Z", "+00:00"))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid publish_at, expected an ISO 8601 datetime")
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        when = when.astimezone(timezone.utc)
+    if post_status == "scheduled":
+        if when is None:
+            raise HTTPException(status_code=400, detail="publish_at is required for scheduled posts")
+        if when <= now:
+            post_status = "published"
+    elif post_status == "published" and (when is None or when > now):
+        when = now
+    return post_status, when.isoformat() if when else None
+
+# Public facets (categories/tags of published posts), refreshed on writes and
+# on every scheduler tick so other workers' writes show up within one poll.
+facet_cache = {"categories": None, "tags": None}
+facet_lock = threading.Lock()
+
+def refresh_facets():
+    published = {"status": "published"}
+    categories = db.posts.distinct("category", published)
+    tags = db.posts.distinct("tags", published)
+    with facet_lock:
+        facet_cache["categories"] = categories
+        facet_cache["tags"] = tags
+
+def get_facet(name):
+    if facet_cache[name] is None:
+        refresh_facets()
+    return facet_cache[name]
+
+def publish_due_posts():
+    now = datetime.now(timezone.utc).isoformat()
+    result = db.posts.update_many(
+        {"status": "scheduled", "publish_at": {"$lte": now}},
+        {"$set": {"status": "published", "updated_at": now}}
+    )
+    return result.modified_count
+
+class PublishScheduler:
+    """Background thread that publishes scheduled posts once they are due.
+
+    Each tick also resumes image uploads whose processing claim went stale.
+    """
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="publish-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval)
+
+    def tick(self):
+        published = publish_due_posts()
+        if published:
+            logger.info("Published %d scheduled post(s)", published)
+        refresh_facets()
+        resume_stalled_images()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Publish scheduler tick failed")
+
+publish_scheduler = PublishScheduler(PUBLISH_POLL_SECONDS)
+
+# Image processing runs in spawned processes so workers never inherit the
+# Mongo client or scheduler thread from this process.
+image_pool = None
+image_pool_lock = threading.Lock()
+# Identifies this process's claims on images being processed
+BOOT_ID = uuid.uuid4().hex
+
+def new_image_pool():
+    return ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+def image_claim():
+    return {"claimed_at": datetime.now(timezone.utc).isoformat(), "claimed_by": BOOT_ID}
+
+def stale_claim_query():
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=IMAGE_CLAIM_TIMEOUT_SECONDS)).isoformat()
+    return {"status": "processing", "$or": [
+        {"claimed_at": {"$exists": False}},
+        {"claimed_at": {"$lt": cutoff}}
+    ]}
+
+def submit_image(image_id, original_path):
+    """Queue an image for processing; returns False if the pool is unusable."""
+    global image_pool
+    args = (process_image, original_path, os.path.join(UPLOAD_DIR, "variants"), image_id)
+    pool = image_pool
+    try:
+        future = pool.submit(*args)
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory), which breaks the pool for good
+        logger.warning("Image pool is broken, starting a new one")
+        with image_pool_lock:
+            if image_pool is pool:
+                image_pool = new_image_pool()
+            pool = image_pool
+        try:
+            future = pool.submit(*args)
+        except BrokenProcessPool:
+            logger.exception("Could not queue image %s", image_id)
+            db.images.update_one({"_id": image_id}, {"$set": {"status": "failed"}})
+            return False
+    future.add_done_callback(partial(image_processed, image_id))
+    return True
+
+def resume_stalled_images():
+    """Resubmit uploads whose processing was cut short by a restart or crash.
+
+    Each record is claimed atomically first, so with several workers only
+    one of them picks it up.
+    """
+    if image_pool is None:
+        return
+    while True:
+        image = db.images.find_one_and_update(stale_claim_query(), {"$set": image_claim()})
+        if not image:
+            break
+        submit_image(image["_id"], image["path"])
+
+def release_image_claims():
+    """Drop this process's claims so the next boot resumes them immediately."""
+    db.images.update_many(
+        {"status": "processing", "claimed_by": BOOT_ID},
+        {"$unset": {"claimed_at": "", "claimed_by": ""}}
+    )
+
+def image_processed(image_id, future):
+    if future.cancelled():
+        # Shutdown cancelled it; release_image_claims() frees it for resuming
+        return
+    try:
+        result = future.result()
+    except Exception:
+        logger.exception("Processing image %s failed", image_id)
+        db.images.update_one({"_id": image_id}, {"$set": {"status": "failed"}})
+        return
+    db.images.update_one({"_id": image_id}, {"$set": {**result, "status": "ready"}})
+
+def media_image_id(url):
+    """Return the uploaded image id a featured_image URL points at, if any."""
+    path = urlparse(url or "").path
+    prefix = f"{MEDIA_URL_PREFIX}/originals/"
+    if not path.startswith(prefix):
+        return None
+    return os.path.splitext(path[len(prefix):])[0]
+
+def build_srcset(base_url, image_id, variants, ext):
+    return ", ".join(
+        f"{base_url}{MEDIA_URL_PREFIX}/variants/{image_id}-{v['width']}.{ext} {v['width']}w"
+        for v in variants
+    )
+
+def attach_image_variants(posts):
+    """Add srcset and placeholder fields to posts whose featured image was uploaded."""
+    image_ids = {media_image_id(post.get("featured_image")) for post in posts} - {None}
+    if not image_ids:
+        return posts
+    images = {img["_id"]: img for img in db.images.find({"_id": {"$in": list(image_ids)}, "status": "ready"})}
+    for post in posts:
+        image = images.get(media_image_id(post.get("featured_image")))
+        if not image:
+            continue
+        # Keep variants on the same origin the featured_image URL was saved with
+        parsed = urlparse(post["featured_image"])
+        base_url = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else ""
+        post["featured_image_srcset"] = build_srcset(base_url, image["_id"], image["variants"], "jpg")
+        post["featured_image_srcset_webp"] = build_srcset(base_url, image["_id"], image["variants"], "webp")
+        post["featured_image_placeholder"] = image["placeholder"]
+        post["featured_image_width"] = image["width"]
+        post["featured_image_height"] = image["height"]
+    return posts
+
 # Initialize admin user
 def init_admin():
     admin_email = os.environ.get("ADMIN_EMAIL")
@@ -118,10 +355,38 @@ def startup():
     init_admin()
     # Create indexes
     db.posts.create_index([("title", "text"), ("content", "text"), ("excerpt", "text")])
-    db.posts.create_index("category")
-    db.posts.create_index("tags")
-    db.posts.create_index("is_featured")
-    db.posts.create_index("created_at")
+    db.posts.create_index("created_at")  # admin listing
+    # Posts created before the publishing workflow are live
+    db.posts.update_many(
+        {"status": {"$exists": False}},
+        [{"$set": {"status": "published", "publish_at": "$created_at"}}]
+    )
+    # Public listings filter on status and sort by publish_at; the same
+    # index serves the scheduler's due-post range scan
+    db.posts.create_index([("status", 1), ("publish_at", -1)])
+    db.posts.create_index([("status", 1), ("is_featured", 1), ("publish_at", -1)])
+    db.posts.create_index([("status", 1), ("category", 1), ("publish_at", -1)])
+    db.posts.create_index([("status", 1), ("tags", 1), ("publish_at", -1)])
+    # Superseded by the status-prefixed indexes above
+    existing_indexes = db.posts.index_information()
+    for name in ("category_1", "tags_1", "is_featured_1"):
+        if name in existing_indexes:
+            db.posts.drop_index(name)
+
+    global image_pool
+    os.makedirs(os.path.join(UPLOAD_DIR, "originals"), exist_ok=True)
+    os.makedirs(os.path.join(UPLOAD_DIR, "variants"), exist_ok=True)
+    image_pool = new_image_pool()
+
+    publish_scheduler.tick()
+    publish_scheduler.start()
+
+@app.on_event("shutdown")
+def shutdown():
+    publish_scheduler.stop()
+    if image_pool:
+        image_pool.shutdown(wait=False, cancel_futures=True)
+        release_image_claims()
 
 # Routes
 @app.get("/api/health")
@@ -151,7 +416,7 @@ def get_posts(
     limit: int = 20,
     skip: int = 0
 ):
-    query = {}
+    query = {"status": "published"}
     if category:
         query["category"] = category
     if tag:
@@ -161,38 +426,49 @@ def get_posts(
     if search:
         query["$text"] = {"$search": search}
     
-    posts = list(db.posts.find(query, {"_id": 1, "title": 1, "excerpt": 1, "category": 1, "tags": 1, "featured_image": 1, "is_featured": 1, "created_at": 1, "reading_time": 1}).sort("created_at", -1).skip(skip).limit(limit))
+    posts = list(db.posts.find(query, {"_id": 1, "title": 1, "excerpt": 1, "category": 1, "tags": 1, "featured_image": 1, "is_featured": 1, "created_at": 1, "publish_at": 1, "reading_time": 1}).sort("publish_at", -1).skip(skip).limit(limit))
     total = db.posts.count_documents(query)
-    return {"posts": serialize_docs(posts), "total": total}
+    return {"posts": attach_image_variants(serialize_docs(posts)), "total": total}
 
 @app.get("/api/posts/{post_id}")
 def get_post(post_id: str):
     try:
-        post = db.posts.find_one({"_id": ObjectId(post_id)})
-        if not post:
-            raise HTTPException(status_code=404, detail="Post not found")
-        return serialize_doc(post)
-    except Exception:
+        post = db.posts.find_one({"_id": ObjectId(post_id), "status": "published"})
+    except InvalidId:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    return attach_image_variants([serialize_doc(post)])[0]
+
+@app.get("/api/media/{kind}/{filename}")
+def get_media(kind: str, filename: str):
+    # Files are content-addressed, so they can be cached forever
+    if kind not in ("originals", "variants") or filename != os.path.basename(filename) or filename.startswith("."):
+        raise HTTPException(status_code=404, detail="Image not found")
+    path = os.path.join(UPLOAD_DIR, kind, filename)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Image not found")
+    return FileResponse(path, headers={"Cache-Control": MEDIA_CACHE_CONTROL})
 
 @app.get("/api/categories")
 def get_categories():
-    categories = db.posts.distinct("category")
-    return {"categories": categories}
+    return {"categories": get_facet("categories")}
 
 @app.get("/api/tags")
 def get_tags():
-    tags = db.posts.distinct("tags")
-    return {"tags": tags}
+    return {"tags": get_facet("tags")}
 
 # Blog Posts - Admin Protected
 @app.post("/api/admin/posts")
 def create_post(post: BlogPostCreate, email: str = Depends(verify_token)):
     word_count = len(post.content.split())
     reading_time = max(1, word_count // 200)  # ~200 words per minute
+    post_status, publish_at = resolve_publish_state(post.status, post.publish_at)
     
     post_data = {
         **post.model_dump(),
+        "status": post_status,
+        "publish_at": publish_at,
         "author": "Aditya Patange",
         "reading_time": reading_time,
         "created_at": datetime.now(timezone.utc).isoformat(),
@@ -202,6 +478,7 @@ def create_post(post: BlogPostCreate, email: str = Depends(verify_token)):
     post_data["id"] = str(result.inserted_id)
     if "_id" in post_data:
         del post_data["_id"]
+    refresh_facets()
     return post_data
 
 @app.put("/api/admin/posts/{post_id}")
@@ -211,6 +488,14 @@ def update_post(post_id: str, post: BlogPostUpdate, email: str = Depends(verify_
         if "content" in update_data:
             word_count = len(update_data["content"].split())
             update_data["reading_time"] = max(1, word_count // 200)
+        if "status" in update_data or "publish_at" in update_data:
+            existing = db.posts.find_one({"_id": ObjectId(post_id)}, {"status": 1, "publish_at": 1})
+            if not existing:
+                raise HTTPException(status_code=404, detail="Post not found")
+            update_data["status"], update_data["publish_at"] = resolve_publish_state(
+                update_data.get("status", existing.get("status", "published")),
+                update_data.get("publish_at", existing.get("publish_at"))
+            )
         update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
         
         result = db.posts.update_one({"_id": ObjectId(post_id)}, {"$set": update_data})
@@ -218,9 +503,12 @@ def update_post(post_id: str, post: BlogPostUpdate, email: str = Depends(verify_
             raise HTTPException(status_code=404, detail="Post not found")
         
         updated = db.posts.find_one({"_id": ObjectId(post_id)})
-        return serialize_doc(updated)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=404, detail="Post not found")
+    refresh_facets()
+    return serialize_doc(updated)
 
 @app.delete("/api/admin/posts/{post_id}")
 def delete_post(post_id: str, email: str = Depends(verify_token)):
@@ -228,9 +516,10 @@ def delete_post(post_id: str, email: str = Depends(verify_token)):
         result = db.posts.delete_one({"_id": ObjectId(post_id)})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Post not found")
-        return {"message": "Post deleted successfully"}
     except Exception:
         raise HTTPException(status_code=404, detail="Post not found")
+    refresh_facets()
+    return {"message": "Post deleted successfully"}
 
 @app.get("/api/admin/posts")
 def get_admin_posts(email: str = Depends(verify_token), limit: int = 100, skip: int = 0):
@@ -238,6 +527,70 @@ def get_admin_posts(email: str = Depends(verify_token), limit: int = 100, skip:
     total = db.posts.count_documents({})
     return {"posts": serialize_docs(posts), "total": total}
 
+# Images - Admin Protected
+@app.post("/api/admin/images")
+def upload_image(file: UploadFile = File(...), email: str = Depends(verify_token)):
+    data = file.file.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large")
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty file")
+    # Trust the decoded format, not the client's Content-Type
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            width, height = img.size
+            # EXIF orientations 5-8 are rotated by 90 degrees when processed
+            if img.getexif().get(0x0112) in (5, 6, 7, 8):
+                width, height = height, width
+            img.verify()
+            image_format = img.format
+    except Exception:
+        raise HTTPException(status_code=400, detail="File is not a valid image")
+    ext = ALLOWED_IMAGE_FORMATS.get(image_format)
+    if not ext:
+        raise HTTPException(status_code=400, detail="Unsupported image type")
+    if not variant_sizes(width, height):
+        raise HTTPException(status_code=400, detail="Image aspect ratio is too extreme")
+
+    image_id = hashlib.sha256(data).hexdigest()[:32]
+    existing = db.images.find_one({"_id": image_id}, {"status": 1, "url": 1})
+    if existing and existing["status"] != "failed":
+        # A stalled upload is reclaimed atomically so only one request resubmits it
+        reclaimed = db.images.find_one_and_update({"_id": image_id, **stale_claim_query()}, {"$set": image_claim()})
+        if not reclaimed:
+            return {"id": image_id, "url": existing["url"], "status": existing["status"]}
+
+    filename = f"{image_id}{ext}"
+    url = f"{MEDIA_URL_PREFIX}/originals/{filename}"
+
+    path = os.path.join(UPLOAD_DIR, "originals", filename)
+    with open(path, "wb") as f:
+        f.write(data)
+    db.images.update_one(
+        {"_id": image_id},
+        {"$set": {
+            "path": path,
+            "url": url,
+            "content_type": Image.MIME[image_format],
+            "size": len(data),
+            "status": "processing",
+            **image_claim(),
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }},
+        upsert=True
+    )
+    if not submit_image(image_id, path):
+        raise HTTPException(status_code=503, detail="Image processing is unavailable, try again")
+    return {"id": image_id, "url": url, "status": "processing"}
+
+@app.get("/api/admin/images/{image_id}")
+def get_image(image_id: str, email: str = Depends(verify_token)):
+    image = db.images.find_one({"_id": image_id}, {"path": 0})
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+    image["id"] = image.pop("_id")
+    return image
+
 # Newsletter
 @app.post("/api/newsletter/subscribe")
 def subscribe_newsletter(data: NewsletterSubscribe):
@@ -261,11 +614,15 @@ def get_subscribers(email: str = Depends(verify_token)):
 def get_stats(email: str = Depends(verify_token)):
     total_posts = db.posts.count_documents({})
     total_subscribers = db.newsletter.count_documents({})
-    categories = db.posts.distinct("category")
+    status_counts = {s: db.posts.count_documents({"status": s}) for s in POST_STATUSES}
     return {
         "total_posts": total_posts,
+        "published_posts": status_counts["published"],
+        "draft_posts": status_counts["draft"],
+        "scheduled_posts": status_counts["scheduled"],
         "total_subscribers": total_subscribers,
-        "total_categories": len(categories)
+        # Categories with at least one published post, matching /api/categories
+        "total_categories": len(get_facet("categories"))
     }
 
 if __name__ == "__main__":
@@ -5,10 +5,20 @@ Tests all backend endpoints for the blogging platform
 """
 
 import requests
+import os
 import sys
 import json
-from datetime import datetime
+import time
+import statistics
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
+from dotenv import load_dotenv
+from pymongo import MongoClient
+from bson import ObjectId
+
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend', '.env'))
 
 class PatangeNotesAPITester:
     def __init__(self, base_url="http://localhost:8001"):
@@ -314,6 +324,247 @@ class PatangeNotesAPITester:
         )
         return filter_valid
 
+    def test_draft_and_scheduled_posts_hidden(self):
+        """Test that draft and scheduled posts stay out of public endpoints until published"""
+        if not self.token:
+            self.log_test("Draft/Scheduled Posts Hidden", False, "No admin token")
+            return False
+
+        publish_at = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+        base_post = {
+            "title": "Unpublished Test Post",
+            "excerpt": "Should not be publicly visible.",
+            "content": "Draft content for the publishing workflow test.",
+            "category": "Unpublished Test Category",
+            "tags": ["UnpublishedTestTag"]
+        }
+        created_ids = []
+        for extra in ({"status": "draft"}, {"status": "scheduled", "publish_at": publish_at}):
+            success, response = self.make_request('POST', 'admin/posts', {**base_post, **extra}, auth_required=True)
+            if success and 'id' in response:
+                created_ids.append(response['id'])
+
+        _, listing = self.make_request('GET', 'posts?limit=100')
+        _, categories = self.make_request('GET', 'categories')
+        listed_ids = {post.get('id') for post in listing.get('posts', [])}
+        hidden = (
+            len(created_ids) == 2
+            and not listed_ids.intersection(created_ids)
+            and base_post['category'] not in categories.get('categories', [])
+            and all(self.make_request('GET', f'posts/{post_id}', expected_status=404)[0] for post_id in created_ids)
+        )
+
+        # Publishing the draft makes it visible
+        published = False
+        if created_ids:
+            success, response = self.make_request('PUT', f'admin/posts/{created_ids[0]}',
+                                                {"status": "published"}, auth_required=True)
+            published = success and response.get('status') == 'published' and \
+                self.make_request('GET', f'posts/{created_ids[0]}')[0]
+
+        for post_id in created_ids:
+            self.make_request('DELETE', f'admin/posts/{post_id}', auth_required=True)
+
+        valid = hidden and published
+        self.log_test(
+            "Draft/Scheduled Posts Hidden",
+            valid,
+            f"Created: {created_ids}, hidden: {hidden}, published: {published}" if not valid else "Publishing workflow respected"
+        )
+        return valid
+
+    def test_listing_latency(self, runs: int = 20, max_median_ms: float = 300.0):
+        """Benchmark the public listing to catch regressions from the status filter"""
+        timings = []
+        for endpoint in ('posts', 'posts?featured=true&limit=2', 'posts?category=Technology'):
+            for _ in range(runs):
+                start = time.perf_counter()
+                success, _ = self.make_request('GET', endpoint)
+                if not success:
+                    self.log_test("Listing Latency", False, f"Request failed: {endpoint}")
+                    return False
+                timings.append((time.perf_counter() - start) * 1000)
+
+        median_ms = statistics.median(timings)
+        valid = median_ms <= max_median_ms
+        self.log_test(
+            "Listing Latency",
+            valid,
+            f"Median {median_ms:.1f}ms over {len(timings)} requests (limit {max_median_ms:.0f}ms)"
+        )
+        return valid
+
+    @staticmethod
+    def connect_db():
+        """Connect straight to the backend's database (configured via backend/.env)"""
+        client = MongoClient(os.environ.get('MONGO_URL'), serverSelectionTimeoutMS=5000)
+        return client, client[os.environ.get('DB_NAME')]
+
+    def test_scheduler_publishes_due_post(self):
+        """Test that the background scheduler publishes a scheduled post once publish_at has passed"""
+        if not self.token:
+            self.log_test("Scheduler Publishes Due Post", False, "No admin token")
+            return False
+
+        post_data = {
+            "title": "Scheduled Test Post",
+            "excerpt": "Published by the scheduler.",
+            "content": "Content for the scheduler test.",
+            "category": "Scheduler Test Category",
+            "tags": ["SchedulerTestTag"],
+            "status": "scheduled",
+            "publish_at": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+        }
+        success, post = self.make_request('POST', 'admin/posts', post_data, auth_required=True)
+        if not success or post.get('status') != 'scheduled':
+            self.log_test("Scheduler Publishes Due Post", False, f"Create response: {post}")
+            return False
+
+        visible = False
+        try:
+            # The API refuses past dates for scheduled posts, so backdate it directly
+            client, db = self.connect_db()
+            past = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+            db.posts.update_one({"_id": ObjectId(post['id'])}, {"$set": {"publish_at": past}})
+            client.close()
+
+            deadline = time.time() + int(os.environ.get('PUBLISH_POLL_SECONDS', '30')) + 5
+            while time.time() < deadline:
+                if self.make_request('GET', f"posts/{post['id']}")[0]:
+                    _, categories = self.make_request('GET', 'categories')
+                    visible = post_data['category'] in categories.get('categories', [])
+                    break
+                time.sleep(1)
+        except Exception as e:
+            self.log_test("Scheduler Publishes Due Post", False, str(e))
+            return False
+        finally:
+            self.make_request('DELETE', f"admin/posts/{post['id']}", auth_required=True)
+
+        self.log_test(
+            "Scheduler Publishes Due Post",
+            visible,
+            "Post or its category not public after one poll interval" if not visible else "Due post published by scheduler"
+        )
+        return visible
+
+    @staticmethod
+    def plan_stages(plan: Dict) -> list:
+        """Flatten an explain() plan tree into (stage, indexName) pairs"""
+        plan = plan.get('queryPlan', plan)
+        stages = [(plan.get('stage'), plan.get('indexName'))]
+        children = plan.get('inputStages', []) + ([plan['inputStage']] if 'inputStage' in plan else [])
+        for child in children:
+            stages.extend(PatangeNotesAPITester.plan_stages(child))
+        return stages
+
+    def test_listing_query_plans(self):
+        """Test that public listing queries are served by the status indexes without an in-memory sort"""
+        try:
+            client, db = self.connect_db()
+            posts = db.posts
+            # Mirrors the filters built by get_posts()
+            queries = {
+                'plain': {"status": "published"},
+                'featured': {"status": "published", "is_featured": True},
+                'category': {"status": "published", "category": "Technology"},
+                'tag': {"status": "published", "tags": "AI"},
+            }
+            failures = []
+            for name, query in queries.items():
+                explain = posts.find(query).sort("publish_at", -1).limit(20).explain()
+                stages = self.plan_stages(explain['queryPlanner']['winningPlan'])
+                index_scans = [index for stage, index in stages if stage == 'IXSCAN']
+                uses_status_index = any(
+                    index and index.startswith('status_1_') and index.endswith('publish_at_-1')
+                    for index in index_scans
+                )
+                if not uses_status_index or any(stage == 'SORT' for stage, _ in stages):
+                    failures.append(f"{name}: {stages}")
+            client.close()
+        except Exception as e:
+            self.log_test("Listing Query Plans", False, str(e))
+            return False
+
+        valid = not failures
+        self.log_test(
+            "Listing Query Plans",
+            valid,
+            "; ".join(failures) if not valid else "All listings use status/publish_at indexes with no SORT stage"
+        )
+        return valid
+
+    @staticmethod
+    def make_png(width: int, height: int) -> bytes:
+        """Build a solid-colour PNG without an imaging library"""
+        def chunk(tag: bytes, data: bytes) -> bytes:
+            return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+        row = b'\x00' + b'\x80\x20\x20' * width
+        return (b'\x89PNG\r\n\x1a\n'
+                + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+                + chunk(b'IDAT', zlib.compress(row * height))
+                + chunk(b'IEND', b''))
+
+    def test_image_upload_pipeline(self):
+        """Test uploading a featured image, variant generation and srcset in post responses"""
+        if not self.token:
+            self.log_test("Image Upload Pipeline", False, "No admin token")
+            return False
+
+        try:
+            response = requests.post(
+                f"{self.base_url}/api/admin/images",
+                files={'file': ('test.png', self.make_png(1200, 675), 'image/png')},
+                headers={'Authorization': f'Bearer {self.token}'},
+                timeout=10
+            )
+            upload = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.log_test("Image Upload Pipeline", False, str(e))
+            return False
+        if response.status_code != 200 or 'url' not in upload:
+            self.log_test("Image Upload Pipeline", False, f"Upload response: {upload}")
+            return False
+
+        image = {}
+        for _ in range(20):
+            _, image = self.make_request('GET', f"admin/images/{upload['id']}", auth_required=True)
+            if image.get('status') != 'processing':
+                break
+            time.sleep(0.5)
+        if image.get('status') != 'ready':
+            self.log_test("Image Upload Pipeline", False, f"Image not processed: {image}")
+            return False
+
+        variant = image['variants'][0]['width']
+        variant_response = requests.get(f"{self.base_url}/api/media/variants/{upload['id']}-{variant}.webp", timeout=10)
+        cached = variant_response.status_code == 200 and \
+            'immutable' in variant_response.headers.get('Cache-Control', '')
+
+        post_data = {
+            "title": "Image Pipeline Test Post",
+            "excerpt": "Checks srcset generation.",
+            "content": "Content for the image pipeline test.",
+            "category": "Technology",
+            "tags": ["Images"],
+            "featured_image": f"{self.base_url}{upload['url']}"
+        }
+        _, post = self.make_request('POST', 'admin/posts', post_data, auth_required=True)
+        _, public_post = self.make_request('GET', f"posts/{post.get('id')}")
+        has_srcset = bool(public_post.get('featured_image_srcset')) and \
+            bool(public_post.get('featured_image_srcset_webp')) and \
+            public_post.get('featured_image_placeholder', '').startswith('data:image/')
+        if post.get('id'):
+            self.make_request('DELETE', f"admin/posts/{post['id']}", auth_required=True)
+
+        valid = cached and has_srcset
+        self.log_test(
+            "Image Upload Pipeline",
+            valid,
+            f"Cached variant: {cached}, srcset: {has_srcset}" if not valid else f"Generated {len(image['variants'])} variant sizes"
+        )
+        return valid
+
     def test_delete_blog_post(self):
         """Test deleting a blog post (cleanup)"""
         if not self.token or not self.created_post_id:
@@ -371,6 +622,15 @@ class PatangeNotesAPITester:
         self.test_search_posts()
         self.test_filter_posts_by_category()
 
+        # Publishing workflow
+        self.test_draft_and_scheduled_posts_hidden()
+        self.test_scheduler_publishes_due_post()
+        self.test_listing_query_plans()
+        self.test_listing_latency()
+
+        # Image pipeline
+        self.test_image_upload_pipeline()
+
         # Cleanup
         self.test_delete_blog_post()
 
@@ -2,6 +2,7 @@ import React from 'react';
 import { Link } from 'react-router-dom';
 import { motion } from 'framer-motion';
 import { Clock, ArrowUpRight } from 'lucide-react';
+import { PostImage } from './PostImage';
 
 export const BlogCard = ({ post, index = 0, featured = false }) => {
   const categoryImages = {
@@ -28,9 +29,11 @@ export const BlogCard = ({ post, index = 0, featured = false }) => {
           <div className="grid grid-cols-1 lg:grid-cols-2">
             {/* Image */}
             <div className="relative h-64 lg:h-full overflow-hidden">
-              <img
+              <PostImage
+                post={post}
                 src={imageUrl}
-                alt={post.title}
+                sizes="(min-width: 1024px) 50vw, 100vw"
+                eager={index === 0}
                 className="blog-card-image w-full h-full object-cover grayscale group-hover:grayscale-0 transition-all duration-700"
               />
               <div className="absolute inset-0 bg-gradient-to-r from-transparent to-[#0A0A0A]/50" />
@@ -78,9 +81,10 @@ export const BlogCard = ({ post, index = 0, featured = false }) => {
       <Link to={`/blog/${post.id}`} className="flex flex-col h-full">
         {/* Image */}
         <div className="relative h-48 overflow-hidden">
-          <img
+          <PostImage
+            post={post}
             src={imageUrl}
-            alt={post.title}
+            sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
             className="blog-card-image w-full h-full object-cover grayscale group-hover:grayscale-0 transition-all duration-700"
           />
           <div className="absolute inset-0 bg-gradient-to-t from-[#0A0A0A] to-transparent" />
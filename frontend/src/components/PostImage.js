@@ -0,0 +1,42 @@
+import React from 'react';
+
+// Renders a post's featured image, using the resized WebP/JPEG variants and
+// blur placeholder when the image was uploaded through the admin panel.
+export const PostImage = ({ post, src, sizes, className = '', eager = false }) => {
+  const placeholderStyle = post.featured_image_placeholder
+    ? {
+        backgroundImage: `url(${post.featured_image_placeholder})`,
+        backgroundSize: 'cover',
+        backgroundPosition: 'center'
+      }
+    : undefined;
+
+  if (!post.featured_image_srcset) {
+    return (
+      <img
+        src={src}
+        alt={post.title}
+        loading={eager ? 'eager' : 'lazy'}
+        className={className}
+      />
+    );
+  }
+
+  return (
+    <picture>
+      <source type="image/webp" srcSet={post.featured_image_srcset_webp} sizes={sizes} />
+      <img
+        src={src}
+        srcSet={post.featured_image_srcset}
+        sizes={sizes}
+        width={post.featured_image_width}
+        height={post.featured_image_height}
+        alt={post.title}
+        loading={eager ? 'eager' : 'lazy'}
+        decoding="async"
+        style={placeholderStyle}
+        className={className}
+      />
+    </picture>
+  );
+};
@@ -3,7 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import { motion, AnimatePresence } from 'framer-motion';
 import { 
   Activity, LogOut, Plus, Edit, Trash2, Eye, Users, FileText, 
-  Tag, X, Save, ArrowLeft, BarChart3 
+  Tag, X, Save, ArrowLeft, BarChart3, Upload 
 } from 'lucide-react';
 import axios from 'axios';
 import { toast } from 'sonner';
@@ -38,9 +38,12 @@ export default function AdminDashboard() {
     tags: '',
     featured_image: '',
     sources: '',
-    is_featured: false
+    is_featured: false,
+    status: 'published',
+    publish_at: ''
   });
   const [saving, setSaving] = useState(false);
+  const [uploading, setUploading] = useState(false);
   const navigate = useNavigate();
   const { logout } = useAuth();
 
@@ -79,6 +82,14 @@ export default function AdminDashboard() {
     toast.success('Logged out successfully.');
   };
 
+  // datetime-local inputs work in local time without a zone suffix
+  const toLocalInput = (isoString) => {
+    if (!isoString) return '';
+    const date = new Date(isoString);
+    const offset = date.getTimezoneOffset() * 60000;
+    return new Date(date.getTime() - offset).toISOString().slice(0, 16);
+  };
+
   const openEditor = (post = null) => {
     if (post) {
       setEditingPost(post);
@@ -90,7 +101,9 @@ export default function AdminDashboard() {
         tags: post.tags?.join(', ') || '',
         featured_image: post.featured_image || '',
         sources: post.sources?.join('\n') || '',
-        is_featured: post.is_featured || false
+        is_featured: post.is_featured || false,
+        status: post.status || 'published',
+        publish_at: toLocalInput(post.publish_at)
       });
     } else {
       setEditingPost(null);
@@ -102,7 +115,9 @@ export default function AdminDashboard() {
         tags: '',
         featured_image: '',
         sources: '',
-        is_featured: false
+        is_featured: false,
+        status: 'published',
+        publish_at: ''
       });
     }
     setShowEditor(true);
@@ -125,8 +140,12 @@ export default function AdminDashboard() {
       tags: formData.tags.split(',').map(t => t.trim()).filter(Boolean),
       featured_image: formData.featured_image,
       sources: formData.sources.split('\n').map(s => s.trim()).filter(Boolean),
-      is_featured: formData.is_featured
+      is_featured: formData.is_featured,
+      status: formData.status
     };
+    if (formData.status === 'scheduled' && formData.publish_at) {
+      payload.publish_at = new Date(formData.publish_at).toISOString();
+    }
 
     try {
       if (editingPost) {
@@ -150,6 +169,27 @@ export default function AdminDashboard() {
     }
   };
 
+  const handleImageUpload = async (e) => {
+    const file = e.target.files?.[0];
+    e.target.value = '';
+    if (!file) return;
+    setUploading(true);
+
+    const data = new FormData();
+    data.append('file', file);
+    try {
+      const response = await axios.post(`${API_URL}/api/admin/images`, data, {
+        headers: { Authorization: `Bearer ${getToken()}` }
+      });
+      setFormData((current) => ({ ...current, featured_image: `${API_URL}${response.data.url}` }));
+      toast.success('Image uploaded. Variants are being generated.');
+    } catch (error) {
+      toast.error(error.response?.data?.detail || 'Failed to upload image.');
+    } finally {
+      setUploading(false);
+    }
+  };
+
   const handleDelete = async (postId) => {
     if (!window.confirm('Are you sure you want to delete this post?')) return;
 
@@ -207,6 +247,9 @@ export default function AdminDashboard() {
               <div>
                 <p className="font-mono text-3xl text-white font-bold">{stats.total_posts}</p>
                 <p className="text-gray-500 text-sm">Total Posts</p>
+                <p className="font-mono text-xs text-gray-600" data-testid="post-status-counts">
+                  {stats.published_posts ?? 0} published · {stats.draft_posts ?? 0} drafts · {stats.scheduled_posts ?? 0} scheduled
+                </p>
               </div>
             </div>
           </motion.div>
@@ -234,7 +277,7 @@ export default function AdminDashboard() {
               <BarChart3 className="w-8 h-8 text-gray-500" />
               <div>
                 <p className="font-mono text-3xl text-white font-bold">{stats.total_categories}</p>
-                <p className="text-gray-500 text-sm">Categories</p>
+                <p className="text-gray-500 text-sm">Published Categories</p>
               </div>
             </div>
           </motion.div>
@@ -266,6 +309,7 @@ export default function AdminDashboard() {
                     <th className="text-left font-mono text-xs uppercase tracking-widest text-gray-500 px-6 py-4">Title</th>
                     <th className="text-left font-mono text-xs uppercase tracking-widest text-gray-500 px-6 py-4">Category</th>
                     <th className="text-left font-mono text-xs uppercase tracking-widest text-gray-500 px-6 py-4">Date</th>
+                    <th className="text-left font-mono text-xs uppercase tracking-widest text-gray-500 px-6 py-4">Status</th>
                     <th className="text-left font-mono text-xs uppercase tracking-widest text-gray-500 px-6 py-4">Featured</th>
                     <th className="text-right font-mono text-xs uppercase tracking-widest text-gray-500 px-6 py-4">Actions</th>
                   </tr>
@@ -289,6 +333,14 @@ export default function AdminDashboard() {
                       <td className="px-6 py-4">
                         <span className="font-mono text-xs text-gray-500">{formatDate(post.created_at)}</span>
                       </td>
+                      <td className="px-6 py-4">
+                        <span className="font-mono text-xs uppercase text-gray-400" data-testid={`post-status-${post.id}`}>
+                          {post.status || 'published'}
+                          {post.status === 'scheduled' && post.publish_at && (
+                            <span className="block normal-case text-gray-600">{formatDate(post.publish_at)}</span>
+                          )}
+                        </span>
+                      </td>
                       <td className="px-6 py-4">
                         {post.is_featured && (
                           <span className="font-mono text-xs text-white bg-[#262626] px-2 py-1 rounded-sm">Featured</span>
@@ -296,15 +348,25 @@ export default function AdminDashboard() {
                       </td>
                       <td className="px-6 py-4">
                         <div className="flex items-center justify-end gap-2">
-                          <a
-                            href={`/blog/${post.id}`}
-                            target="_blank"
-                            rel="noopener noreferrer"
-                            className="p-2 text-gray-500 hover:text-white transition-colors duration-200"
-                            title="View"
-                          >
-                            <Eye className="w-4 h-4" />
-                          </a>
+                          {(post.status || 'published') === 'published' ? (
+                            <a
+                              href={`/blog/${post.id}`}
+                              target="_blank"
+                              rel="noopener noreferrer"
+                              className="p-2 text-gray-500 hover:text-white transition-colors duration-200"
+                              title="View"
+                            >
+                              <Eye className="w-4 h-4" />
+                            </a>
+                          ) : (
+                            <span
+                              className="p-2 text-gray-700 cursor-not-allowed"
+                              title="Not published yet"
+                              data-testid={`view-post-disabled-${post.id}`}
+                            >
+                              <Eye className="w-4 h-4" />
+                            </span>
+                          )}
                           <button
                             onClick={() => openEditor(post)}
                             className="p-2 text-gray-500 hover:text-white transition-colors duration-200"
@@ -462,6 +524,40 @@ export default function AdminDashboard() {
                   </div>
                 </div>
 
+                {/* Status & Publish Date */}
+                <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
+                  <div>
+                    <label className="block font-mono text-xs uppercase tracking-widest text-gray-500 mb-2">
+                      Status
+                    </label>
+                    <select
+                      value={formData.status}
+                      onChange={(e) => setFormData({ ...formData, status: e.target.value })}
+                      className="w-full bg-[#050505] border border-[#262626] text-white focus:border-white focus:ring-0 rounded-sm px-4 py-3 font-mono text-sm transition-colors duration-300"
+                      data-testid="post-status-select"
+                    >
+                      <option value="draft">Draft</option>
+                      <option value="scheduled">Scheduled</option>
+                      <option value="published">Published</option>
+                    </select>
+                  </div>
+                  {formData.status === 'scheduled' && (
+                    <div>
+                      <label className="block font-mono text-xs uppercase tracking-widest text-gray-500 mb-2">
+                        Publish At *
+                      </label>
+                      <input
+                        type="datetime-local"
+                        value={formData.publish_at}
+                        onChange={(e) => setFormData({ ...formData, publish_at: e.target.value })}
+                        required
+                        className="w-full bg-[#050505] border border-[#262626] text-white focus:border-white focus:ring-0 rounded-sm px-4 py-3 font-mono text-sm transition-colors duration-300"
+                        data-testid="post-publish-at-input"
+                      />
+                    </div>
+                  )}
+                </div>
+
                 {/* Tags */}
                 <div>
                   <label className="block font-mono text-xs uppercase tracking-widest text-gray-500 mb-2">
@@ -483,14 +579,29 @@ export default function AdminDashboard() {
                   <label className="block font-mono text-xs uppercase tracking-widest text-gray-500 mb-2">
                     Featured Image URL (optional)
                   </label>
-                  <input
-                    type="url"
-                    value={formData.featured_image}
-                    onChange={(e) => setFormData({ ...formData, featured_image: e.target.value })}
-                    className="w-full bg-[#050505] border border-[#262626] text-white placeholder:text-gray-600 focus:border-white focus:ring-0 rounded-sm px-4 py-3 font-mono text-sm transition-colors duration-300"
-                    placeholder="https://example.com/image.jpg"
-                    data-testid="post-image-input"
-                  />
+                  <div className="flex gap-4">
+                    <input
+                      type="url"
+                      value={formData.featured_image}
+                      onChange={(e) => setFormData({ ...formData, featured_image: e.target.value })}
+                      className="w-full bg-[#050505] border border-[#262626] text-white placeholder:text-gray-600 focus:border-white focus:ring-0 rounded-sm px-4 py-3 font-mono text-sm transition-colors duration-300"
+                      placeholder="https://example.com/image.jpg"
+                      data-testid="post-image-input"
+                    />
+                    <label
+                      className={`shrink-0 flex items-center gap-2 bg-transparent border border-[#262626] text-gray-400 hover:border-white hover:text-white font-mono uppercase tracking-wider text-sm px-4 py-3 rounded-sm transition-colors duration-300 ${uploading ? 'opacity-50 pointer-events-none' : 'cursor-pointer'}`}
+                    >
+                      <Upload className="w-4 h-4" />
+                      {uploading ? 'Uploading...' : 'Upload'}
+                      <input
+                        type="file"
+                        accept="image/jpeg,image/png,image/webp,image/gif"
+                        onChange={handleImageUpload}
+                        className="hidden"
+                        data-testid="post-image-upload"
+                      />
+                    </label>
+                  </div>
                 </div>
 
                 {/* Sources */}
@@ -6,6 +6,7 @@ import axios from 'axios';
 import { toast } from 'sonner';
 import { Navbar } from '../components/Navbar';
 import { Footer } from '../components/Footer';
+import { PostImage } from '../components/PostImage';
 
 const API_URL = process.env.REACT_APP_BACKEND_URL;
 
@@ -91,9 +92,11 @@ export default function BlogPostPage() {
 
       {/* Hero Image */}
       <div className="relative h-[50vh] md:h-[60vh] overflow-hidden">
-        <img
+        <PostImage
+          post={post}
           src={imageUrl}
-          alt={post.title}
+          sizes="100vw"
+          eager
           className="w-full h-full object-cover grayscale"
         />
         <div className="absolute inset-0 bg-gradient-to-t from-[#050505] via-[#050505]/50 to-transparent" />
@@ -140,7 +143,7 @@ export default function BlogPostPage() {
               <span className="w-1 h-1 bg-gray-600 rounded-full" />
               <span className="font-mono text-xs text-gray-500 flex items-center gap-1">
                 <Calendar className="w-3 h-3" />
-                {formatDate(post.created_at)}
+                {formatDate(post.publish_at || post.created_at)}
               </span>
             </div>
 